@@ -24,6 +24,12 @@
 #define LED_PIN    6
 #define LED_COUNT  16
 
+// 1 = send fixed-size binary packets instead of text lines.
+// Must match BINARY_PROTOCOL in Controls/toastbot_algo.py
+#define BINARY_PROTOCOL 0
+#define PACKET_SYNC 0xAA
+#define PACKET_SIZE 22  // sync + 4 x uint16 + 3 x float + checksum
+
 SparkFun_APDS9960 apds = SparkFun_APDS9960();
 Adafruit_NeoPixel strip(LED_COUNT, LED_PIN, NEO_GRB + NEO_KHZ800);
 
@@ -92,6 +98,11 @@ void loop() {
       apds.readGreenLight(green_light) &&
       apds.readBlueLight(blue_light)) {
 
+    convertRGBToLAB(red_light, green_light, blue_light);
+
+#if BINARY_PROTOCOL
+    sendBinaryPacket();
+#else
     Serial.print("Ambient: ");
     Serial.print(ambient_light);
     Serial.print(" Red: ");
@@ -101,8 +112,6 @@ void loop() {
     Serial.print(" Blue: ");
     Serial.println(blue_light);
 
-    convertRGBToLAB(red_light, green_light, blue_light);
-
     Serial.print("L: ");
     Serial.print(L);
     Serial.print(" a: ");
@@ -110,6 +119,7 @@ void loop() {
     Serial.print(" b: ");
     Serial.println(b);
     Serial.println("-------------------");
+#endif
   }
 
   // Manual PWM Section
@@ -176,6 +186,28 @@ void loop() {
   }
 }
 
+// Send the latest readings as one binary packet (little-endian):
+// sync, ambient, red, green, blue (uint16), L, a, b (float), XOR checksum
+void sendBinaryPacket() {
+  uint8_t packet[PACKET_SIZE];
+  packet[0] = PACKET_SYNC;
+  memcpy(&packet[1], &ambient_light, 2);
+  memcpy(&packet[3], &red_light, 2);
+  memcpy(&packet[5], &green_light, 2);
+  memcpy(&packet[7], &blue_light, 2);
+  memcpy(&packet[9], &L, 4);
+  memcpy(&packet[13], &a, 4);
+  memcpy(&packet[17], &b, 4);
+
+  uint8_t checksum = 0;
+  for (int i = 1; i < PACKET_SIZE - 1; i++) {
+    checksum ^= packet[i];
+  }
+  packet[PACKET_SIZE - 1] = checksum;
+
+  Serial.write(packet, PACKET_SIZE);
+}
+
 // RGB to LAB Conversion
 void convertRGBToLAB(float R, float G, float B) {
   float maxVal = max(max(R, G), B);
@@ -16,48 +16,221 @@ import time
 import csv
 import re
 import math
+import collections
+import struct
+import sys
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
 
 # Constants
 PORT = "COM5"
 BAUD_RATE = 9600
 TIMEOUT = 1
-
-# Equation models for different power levels
-GOLDENING_100_EQUATION = lambda t: 43.29 * (1 - math.exp(-0.03184 * t)) + 244.79
-BROWNING_100_EQUATION = lambda t: -0.07551 * t + 311.22
-
-GOLDENING_80_EQUATION = lambda t: 62.32 * (1 - math.exp(-0.02597 * t)) + 139.48
-BROWNING_80_EQUATION = lambda t: -0.01715 * t + 195.10
-
-LINEAR_60_EQUATION = lambda t: -0.01086 * t + 136.70
+VERBOSE = False  # Full per-packet status output instead of a one-line summary
+# Read fixed-size binary sensor packets instead of text lines. Must match
+# BINARY_PROTOCOL in Arduino/colour_sense_test.ino
+BINARY_PROTOCOL = False
+
+# Equation model coefficients for different power levels
+# Goldening: R(t) = amplitude * (1 - exp(-rate * t)) + base
+GOLDENING_100_COEFFS = (43.29, 0.03184, 244.79)
+GOLDENING_80_COEFFS = (62.32, 0.02597, 139.48)
+# Linear: R(t) = slope * t + intercept
+BROWNING_100_COEFFS = (-0.07551, 311.22)
+BROWNING_80_COEFFS = (-0.01715, 195.10)
+LINEAR_60_COEFFS = (-0.01086, 136.70)
+
+
+def _linear_curve(slope, intercept, shift=0.0):
+    """Build R(t) = slope * (t + shift) + intercept with its coefficients bound in"""
+    if shift:
+        return lambda t: slope * (t + shift) + intercept
+    return lambda t: slope * t + intercept
+
+
+def _goldening_phase_model(
+    goldening_coeffs, threshold=math.inf, browning_coeffs=(0.0, 0.0)
+):
+    """Build R(t) for the goldening phase: the curve up to threshold, then the line
+
+    Without a threshold this is just the goldening curve.
+    """
+    amplitude, rate, base = goldening_coeffs
+    slope, intercept = browning_coeffs
+    # exp is evaluated directly: packets arrive at a variable interval, so an
+    # incremental state *= exp(-rate * dt) update still needs an exp per packet
+    # and its state bookkeeping measured slower than the single call
+    exp = math.exp
+
+    def model(t):
+        if t <= threshold:
+            return amplitude * (1 - exp(-rate * t)) + base
+        return slope * t + intercept
+
+    return model
+
+
+# Equation models used outside the per-phase models bound by the controller
+GOLDENING_80_EQUATION = _goldening_phase_model(GOLDENING_80_COEFFS)
+LINEAR_60_EQUATION = _linear_curve(*LINEAR_60_COEFFS)
 
 RATE_DIFF_100 = 1.10401
 RATE_DIFF_80 = 0.55556
 
 DEFAULT_POWER = 80
+# Serial commands for the power levels the controller uses
+_POWER_CMDS = {level: f"{level}\n".encode() for level in (0, 60, 80, 100)}
 TARGET_R_VALUE = None
 
 GOLDENING_THRESHOLD = 285.0
+GOLDENING_100_THRESHOLD = 258.15  # Goldening end time at 100% power
+# Expected R value at the end of goldening, from the 80% power equation
+_TRANSITION_R = GOLDENING_80_EQUATION(GOLDENING_THRESHOLD)
 ADJUSTMENT_CHECK_INTERVAL = 1.0
 MAX_ADJUSTMENT_TIME = 10.0
+CSV_FLUSH_ROWS = 32  # Buffered log rows that trigger a write
+CSV_FLUSH_INTERVAL = 5.0  # Maximum seconds between log writes
+DISPLAY_REFRESH_TICKS = 10  # Packets between refreshes of the verbose time estimates
+
+# Integer phase codes, compared when selecting the expected R model
+PHASE_GOLDENING = 0
+PHASE_BROWNING = 1
+
+
+def _r_to_time_remaining(r_value):
+    """Browning time remaining for an R value, from the 80% power equation"""
+    # Using the browning equation: R(t) = slope * t + intercept
+    # Solve for t: t = (R - intercept) / slope
+    slope, intercept = BROWNING_80_COEFFS
+    time_remaining = (r_value - intercept) / slope
+    # Ensure we don't return negative time values
+    return max(60, time_remaining)  # At least 60 seconds as a safety
+
+
+# Browning time expected once goldening ends, estimated from the transition R
+# value with the browning equation. If that R is above the browning equation's
+# y-intercept the equation gives negative time, so use a default estimate
+# based on typical browning time instead
+if _TRANSITION_R > BROWNING_80_COEFFS[1]:
+    _GOLDENING_BROWNING_TIME = 300  # Default to 5 minutes
+else:
+    _GOLDENING_BROWNING_TIME = _r_to_time_remaining(_TRANSITION_R)
+
+
+def _adjustment_time(difference, to_power):
+    """Time needed at to_power to close an R difference"""
+    if to_power == 100:
+        # Using rate difference for 100% power
+        calculated_time = abs(difference) / RATE_DIFF_100
+    else:  # to_power == 60
+        # Using rate difference for 60% power
+        calculated_time = abs(difference) / RATE_DIFF_80
+
+    # Limit adjustment time to maximum allowed
+    return min(calculated_time, MAX_ADJUSTMENT_TIME)
+
+
+# Serial line formats sent by the Arduino sketch
+# (matched against the raw bytes, int() and float() accept bytes directly)
+_RGB_RE = re.compile(rb"Ambient: (\d+) Red: (\d+) Green: (\d+) Blue: (\d+)")
+_LAB_RE = re.compile(rb"L: ([\d\.]+) a: ([\d\.]+) b: ([\d\.]+)")
+# Field labels of the same lines, checked by the split fast paths
+_RGB_LABELS = [b"Ambient:", b"Red:", b"Green:", b"Blue:"]
+_LAB_LABELS = [b"L:", b"a:", b"b:"]
+
+
+# Binary sensor packet: sync byte, ambient, red, green, blue (uint16),
+# L, a, b (float32), XOR checksum of everything between sync and checksum
+PACKET_SYNC = 0xAA
+_PKT = struct.Struct("<BHHHHfffB")
+
+
+def _xor_checksum(data):
+    """XOR of all bytes in data"""
+    checksum = 0
+    for byte in data:
+        checksum ^= byte
+    return checksum
+
+
+def _parse_rgb(line):
+    """Parse a raw Ambient/RGB sensor line into (ambient, r, g, b), or None"""
+    # Fast path: the line has a fixed "Ambient: N Red: N Green: N Blue: N" shape,
+    # taken only when the labels and digit-only values match what _RGB_RE accepts
+    parts = line.split()
+    if len(parts) == 8 and parts[::2] == _RGB_LABELS:
+        values = parts[1::2]
+        if b"".join(values).isdigit():
+            return int(values[0]), int(values[1]), int(values[2]), int(values[3])
+    # Fall back to the regex for anything unexpected
+    match = _RGB_RE.search(line)
+    if match:
+        return tuple(int(v) for v in match.groups())
+    return None
+
+
+def _parse_lab(line):
+    """Parse a raw LAB sensor line into (L, a, b), or None"""
+    # Fast path: the line has a fixed "L: X a: X b: X" shape, taken only when
+    # the labels match and the values are digits and dots, like _LAB_RE accepts
+    parts = line.split()
+    if len(parts) == 6 and parts[::2] == _LAB_LABELS:
+        values = parts[1::2]
+        if b"".join(values).replace(b".", b"").isdigit():
+            try:
+                return float(values[0]), float(values[1]), float(values[2])
+            except ValueError:
+                pass
+    # Fall back to the regex for anything unexpected
+    match = _LAB_RE.search(line)
+    if match:
+        return tuple(float(v) for v in match.groups())
+    return None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread"""
+
+    def prepare(self, record):
+        # The default prepare() formats the message on the calling thread; the
+        # listener runs in this process, so the record can be queued as is
+        return record
 
 
 class ToasterController:
-    def init(self, port, baud_rate, timeout):
+    def __init__(
+        self,
+        port,
+        baud_rate,
+        timeout,
+        target_r=TARGET_R_VALUE,
+        verbose=VERBOSE,
+        binary_protocol=BINARY_PROTOCOL,
+    ):
         self.ser = serial.Serial(port, baud_rate, timeout=timeout)
         time.sleep(2)  # Wait for serial connection to establish
+        self.verbose = verbose  # Print the full status block for every packet
+        # Stop once enough readings reach this R value (None = never)
+        self.target_r = target_r
+        # Sensor data format, see BINARY_PROTOCOL
+        self.binary_protocol = binary_protocol
+        self._rx_buf = bytearray()  # Serial bytes received but not yet parsed
         self.start_time = None
         self.current_power = DEFAULT_POWER
         self.phase = "goldening"  # Start in goldening phase
+        self._phase_code = PHASE_GOLDENING
         self.adjustment_time_left = 0
         self.output_file = "toaster_control_log.csv"
+        self.log_file = "toaster_control.log"
 
         # For R value counting
-        self.r_values_buffer = []
         self.target_r_count = 0  # Counter for readings at/below target
         self.readings_needed = (
             5  # Number of readings needed at/below target (not necessarily consecutive)
         )
+        # Most recent R values used for control, oldest dropped automatically
+        self.r_values_buffer = collections.deque(maxlen=self.readings_needed)
         self.phase_transition_time = None
         self.counting_active = (
             False  # Flag to indicate if we've started counting target readings
@@ -68,6 +241,11 @@ class ToasterController:
         self.minimum_ending_time_buffer = (
             60  # Seconds before estimated time when ending is allowed
         )
+        self._count_window_start = None  # Set by control_loop
+
+        # For verbose status display
+        self._display_tick = 0
+        self._phase_estimate = None  # Last (remaining goldening, remaining browning)
 
         # For tracking effective time at 80% power
         self.effective_time_80_equiv = 0
@@ -77,509 +255,692 @@ class ToasterController:
             80: 1.0,  # Baseline
             60: 0.55,  # 60% power is 0.55 times as effective as 80%
         }
+        # Effectiveness of the current power level, updated by set_power
+        self._current_effectiveness = self.power_effectiveness.get(
+            self.current_power, 1.0
+        )
 
         # For stabilization after power changes
         self.stabilization_needed = False
         self.stabilization_time_left = 0
         self.stabilization_period = 3.0  # Seconds to wait after returning to 80% power
 
-        # Initialize CSV log
-        with open(self.output_file, "w", newline="") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(
-                [
-                    "TimeElapsed",
-                    "PowerLevel",
-                    "Phase",
-                    "R",
-                    "G",
-                    "B",
-                    "ExpectedR",
-                    "Difference",
-                    "Action",
-                    "EffectiveTime",
-                ]
-            )
+        # Initialize CSV log (kept open for the whole run, line-buffered)
+        self._csv_fp = open(self.output_file, "w", newline="", buffering=1)
+        # csv.writer is only used for the header, rows are preformatted in control_loop
+        csv.writer(self._csv_fp).writerow(
+            [
+                "TimeElapsed",
+                "PowerLevel",
+                "Phase",
+                "R",
+                "G",
+                "B",
+                "ExpectedR",
+                "Difference",
+                "Action",
+                "EffectiveTime",
+            ]
+        )
 
-        print("Toaster Control System Initialized")
+        # Expected R model for the current phase and power level
+        self._rebind_expected_r()
+
+        # Rows are collected here and written to the log in batches
+        self._csv_buf = []
+        self._csv_last_flush = None  # Set by control_loop
+
+        # Status output goes through a queue: the control loop only enqueues
+        # records, and a background thread formats and writes them. This is set
+        # up last so nothing after it can raise and leave the listener running;
+        # close() stops it again
+        self.log = logging.getLogger("toastbot")
+        self.log.setLevel(logging.INFO)
+        self.log.propagate = False
+        log_queue = queue.Queue(-1)
+        self._log_handler = _DeferredQueueHandler(log_queue)
+        self.log.addHandler(self._log_handler)
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        file_handler = logging.FileHandler(self.log_file, mode="w")
+        file_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(message)s")
+        )
+        self._log_listener = QueueListener(log_queue, console_handler, file_handler)
+        self._log_listener.start()
 
+        self._closed = False
 
-def set_power(self, power_level):
-    """Send power level command to Arduino"""
-    self.ser.write(f"{power_level}\n".encode())
-    self.current_power = power_level
-    print(f"Power level set to {power_level}%")
+        self.log.info("Toaster Control System Initialized")
 
+    def _flush_log(self):
+        """Write any buffered rows to the CSV log"""
+        if self._csv_buf:
+            self._csv_fp.write("".join(self._csv_buf))
+            self._csv_buf.clear()
 
-def calculate_expected_r(self, elapsed_time):
-    """Calculate expected R value based on current phase and time"""
-    try:
-        if self.phase == "goldening":
-            if self.current_power == 100:
-                if (
-                    elapsed_time <= 258.15
-                ):  # Use the correct time threshold for 100% power
-                    return GOLDENING_100_EQUATION(elapsed_time)
-                else:
-                    return BROWNING_100_EQUATION(elapsed_time)
+    def _readline(self):
+        """Return the next complete line from the serial port, or b"" on timeout"""
+        buf = self._rx_buf
+        while True:
+            end = buf.find(b"\n")
+            if end >= 0:
+                line = bytes(buf[: end + 1])
+                del buf[: end + 1]
+                return line
+            # Drain everything the driver has buffered; if nothing is waiting,
+            # block for a single byte (up to the serial timeout)
+            chunk = self.ser.read(self.ser.in_waiting or 1)
+            if not chunk:
+                return b""  # Timed out, keep any partial line for the next call
+            buf += chunk
+
+    def _read_ascii_packet(self):
+        """Read one Ambient/RGB + LAB line pair, or return None"""
+        line = self._readline()
+        if not line.startswith(b"Ambient:"):
+            return None
+        rgb = _parse_rgb(line)
+        if rgb is None:
+            return None
+        # Read the LAB color values that follow the RGB line
+        lab = _parse_lab(self._readline())
+        if lab is None:
+            return None
+        return rgb + lab
+
+    def _read_binary_packet(self):
+        """Read one binary sensor packet, or return None on timeout
+
+        Frames start with PACKET_SYNC and end with an XOR checksum of the
+        payload. Anything that does not frame cleanly (startup text, line
+        noise) is skipped until the next sync byte.
+        """
+        buf = self._rx_buf
+        size = _PKT.size
+        while True:
+            start = buf.find(PACKET_SYNC)
+            if start < 0:
+                buf.clear()
+            elif start > 0:
+                del buf[:start]
+            if len(buf) >= size:
+                fields = _PKT.unpack_from(buf)
+                if _xor_checksum(buf[1 : size - 1]) == fields[-1]:
+                    del buf[:size]
+                    return fields[1:-1]
+                del buf[:1]  # Corrupt frame, resync on the next sync byte
+                continue
+            chunk = self.ser.read(self.ser.in_waiting or 1)
+            if not chunk:
+                return None
+            buf += chunk
+
+    def set_power(self, power_level):
+        """Send power level command to Arduino"""
+        command = _POWER_CMDS.get(power_level)
+        if command is None:
+            command = f"{power_level}\n".encode()
+        self.ser.write(command)
+        self.current_power = power_level
+        self._current_effectiveness = self.power_effectiveness.get(power_level, 1.0)
+        self._rebind_expected_r()
+        self.log.info("Power level set to %s%%", power_level)
+
+    def calculate_expected_r(self, elapsed_time):
+        """Calculate expected R value based on current phase and time"""
+        try:
+            return self._expected_r_fn(elapsed_time)
+        except Exception as e:
+            self.log.error("Error calculating expected R: %s", e)
+            # Return a reasonable default value
+            return 150  # Middle of typical R range
+
+    def _rebind_expected_r(self):
+        """Select the expected R model for the current phase and power level
+
+        Called whenever the phase or power changes, so calculate_expected_r
+        does not have to re-check them on every packet.
+        """
+        power = self.current_power
+        if self._phase_code == PHASE_GOLDENING:
+            if power == 100:
+                # Use the correct time threshold for 100% power
+                fn = _goldening_phase_model(
+                    GOLDENING_100_COEFFS, GOLDENING_100_THRESHOLD, BROWNING_100_COEFFS
+                )
             else:  # 80% power
-                if elapsed_time <= GOLDENING_THRESHOLD:
-                    return GOLDENING_80_EQUATION(elapsed_time)
-                else:
-                    return BROWNING_80_EQUATION(elapsed_time)
+                fn = _goldening_phase_model(
+                    GOLDENING_80_COEFFS, GOLDENING_THRESHOLD, BROWNING_80_COEFFS
+                )
         else:  # browning phase
-            if self.current_power == 100:
-                return BROWNING_100_EQUATION(
-                    elapsed_time - self.phase_transition_time + 258.15
+            transition_time = self.phase_transition_time
+            if power == 100:
+                fn = _linear_curve(
+                    *BROWNING_100_COEFFS,
+                    shift=GOLDENING_100_THRESHOLD - transition_time,
                 )
-            elif self.current_power == 80:
+            elif power == 80:
                 # In browning phase, time is relative to the start of browning
-                time_in_browning = elapsed_time - self.phase_transition_time
-                return BROWNING_80_EQUATION(GOLDENING_THRESHOLD + time_in_browning)
+                fn = _linear_curve(
+                    *BROWNING_80_COEFFS, shift=GOLDENING_THRESHOLD - transition_time
+                )
             else:  # 60% power
-                return LINEAR_60_EQUATION(elapsed_time)
-    except Exception as e:
-        print(f"Error calculating expected R: {e}")
-        # Return a reasonable default value
-        return 150  # Middle of typical R range
-
-
-def r_to_time_remaining(self, r_value):
-    """Convert R value to estimated browning time remaining using 80% power equation"""
-    # Using the browning equation: R(t) = -0.01715*t + 195.10
-    # Solve for t: t = (195.10 - R) / 0.01715
-    time_remaining = (195.10 - r_value) / 0.01715
-    # Ensure we don't return negative time values
-    return max(60, time_remaining)  # At least 60 seconds as a safety
-
-
-def calculate_adjustment_time(self, difference, to_power):
-    """Calculate time needed for power adjustment based on rate differences"""
-    if to_power == 100:
-        # Using rate difference for 100% power
-        calculated_time = abs(difference) / RATE_DIFF_100
-    else:  # to_power == 60
-        # Using rate difference for 60% power
-        calculated_time = abs(difference) / RATE_DIFF_80
-
-    # Limit adjustment time to maximum allowed
-    return min(calculated_time, MAX_ADJUSTMENT_TIME)
+                fn = LINEAR_60_EQUATION
+        self._expected_r_fn = fn
+
+    def r_to_time_remaining(self, r_value):
+        """Convert R value to estimated browning time remaining using 80% power equation"""
+        return _r_to_time_remaining(r_value)
+
+    def calculate_adjustment_time(self, difference, to_power):
+        """Calculate time needed for power adjustment based on rate differences"""
+        return _adjustment_time(difference, to_power)
+
+    def adjust_power(self, current_r, expected_r):
+        """Determine if power adjustment is needed and for how long"""
+        # Timer-driven path: stabilization or an adjustment period is running
+        action = self._tick_timers(ADJUSTMENT_CHECK_INTERVAL)
+        if action is not None:
+            return action
+
+        # Only check if adjustment is needed when at baseline power (80%) and not in stabilization
+        if self.current_power == 80 and not self.stabilization_needed:
+            return self._decide(current_r, expected_r)
+        return f"Maintaining current power at {self.current_power}%"
 
+    def _tick_timers(self, dt):
+        """Count down stabilization/adjustment periods, or return None when idle"""
+        # If we're in a stabilization period after returning to 80% power
+        if self.stabilization_needed and self.current_power == 80:
+            self.stabilization_time_left -= dt
+            if self.stabilization_time_left <= 0:
+                self.log.info("===== STABILIZATION COMPLETE =====")
+                self.log.info(
+                    "Sensor readings have stabilized, resuming normal control"
+                )
+                self.stabilization_needed = False
+            elif self.verbose:
+                self.log.info(
+                    "Stabilization period: %.1fs remaining",
+                    self.stabilization_time_left,
+                )
+                self.log.info(
+                    "(R values not used for control decisions during stabilization)"
+                )
+            return "Waiting for sensor readings to stabilize"
+
+        # If we're already in an adjustment period, continue with it without checking R values
+        if self.adjustment_time_left > 0:
+            self.adjustment_time_left -= dt
+            if self.adjustment_time_left <= 0:
+                self.log.info("===== ADJUSTMENT COMPLETE =====")
+                self.log.info("Returning to 80% power baseline")
+                self.set_power(80)
+                # Start stabilization period
+                self.stabilization_needed = True
+                self.stabilization_time_left = self.stabilization_period
+                self.log.info(
+                    "Starting %ss stabilization period", self.stabilization_period
+                )
+            elif self.verbose:
+                self.log.info(
+                    "Remaining time at %s%% power: %.1fs",
+                    self.current_power,
+                    self.adjustment_time_left,
+                )
+                self.log.info(
+                    "(Note: R values during power adjustment are not used for control decisions)"
+                )
+            return "Completing power adjustment period"
 
-def adjust_power(self, current_r, expected_r):
-    """Determine if power adjustment is needed and for how long"""
-    difference = current_r - expected_r
+        return None
 
-    # If we're in a stabilization period after returning to 80% power
-    if self.stabilization_needed and self.current_power == 80:
-        self.stabilization_time_left -= ADJUSTMENT_CHECK_INTERVAL
-        if self.stabilization_time_left <= 0:
-            print("\n===== STABILIZATION COMPLETE =====")
-            print(f"Sensor readings have stabilized, resuming normal control")
-            self.stabilization_needed = False
-        else:
-            print(
-                f"Stabilization period: {self.stabilization_time_left:.1f}s remaining"
-            )
-            print(f"(R values not used for control decisions during stabilization)")
-        return "Waiting for sensor readings to stabilize"
-
-    # If we're already in an adjustment period, continue with it without checking R values
-    if self.adjustment_time_left > 0:
-        self.adjustment_time_left -= ADJUSTMENT_CHECK_INTERVAL
-        if self.adjustment_time_left <= 0:
-            print("\n===== ADJUSTMENT COMPLETE =====")
-            print(f"Returning to 80% power baseline")
-            self.set_power(80)
-            # Start stabilization period
-            self.stabilization_needed = True
-            self.stabilization_time_left = self.stabilization_period
-            print(f"Starting {self.stabilization_period}s stabilization period")
-        else:
-            print(
-                f"Remaining time at {self.current_power}% power: {self.adjustment_time_left:.1f}s"
-            )
-            print(
-                f"(Note: R values during power adjustment are not used for control decisions)"
-            )
-        return "Completing power adjustment period"
+    def _decide(self, current_r, expected_r):
+        """Choose a power adjustment from the R value (only called at stable 80% power)"""
+        difference = current_r - expected_r
 
-    # Only check if adjustment is needed when at baseline power (80%) and not in stabilization
-    if self.current_power == 80 and not self.stabilization_needed:
         # Check if R value is behind or ahead of prediction
         if difference < -5:  # R value is behind (lower than expected)
             # Increase power to catch up
             self.set_power(100)
             self.adjustment_time_left = self.calculate_adjustment_time(difference, 100)
-            print(f"\n===== POWER ADJUSTMENT =====")
-            print(
-                f"R value behind by {abs(difference):.2f}, increasing power to 100% for {self.adjustment_time_left:.2f}s"
+            self.log.info("===== POWER ADJUSTMENT =====")
+            self.log.info(
+                "R value behind by %.2f, increasing power to 100%% for %.2fs",
+                abs(difference),
+                self.adjustment_time_left,
             )
-            print(f"(Maximum adjustment time limited to {MAX_ADJUSTMENT_TIME}s)")
-            print(f"Will return to 80% baseline after adjustment period")
+            self.log.info(
+                "(Maximum adjustment time limited to %ss)", MAX_ADJUSTMENT_TIME
+            )
+            self.log.info("Will return to 80% baseline after adjustment period")
             return f"Increasing power to 100% for {self.adjustment_time_left:.2f}s"
         elif difference > 5:  # R value is ahead (higher than expected)
             # Decrease power to slow down
             self.set_power(60)
             self.adjustment_time_left = self.calculate_adjustment_time(difference, 60)
-            print(f"\n===== POWER ADJUSTMENT =====")
-            print(
-                f"R value ahead by {difference:.2f}, decreasing power to 60% for {self.adjustment_time_left:.2f}s"
+            self.log.info("===== POWER ADJUSTMENT =====")
+            self.log.info(
+                "R value ahead by %.2f, decreasing power to 60%% for %.2fs",
+                difference,
+                self.adjustment_time_left,
+            )
+            self.log.info(
+                "(Maximum adjustment time limited to %ss)", MAX_ADJUSTMENT_TIME
             )
-            print(f"(Maximum adjustment time limited to {MAX_ADJUSTMENT_TIME}s)")
-            print(f"Will return to 80% baseline after adjustment period")
+            self.log.info("Will return to 80% baseline after adjustment period")
             return f"Decreasing power to 60% for {self.adjustment_time_left:.2f}s"
         else:
             return "On track, maintaining 80% power"
-    else:
-        return f"Maintaining current power at {self.current_power}%"
 
+    def update_effective_time(self, current_time):
+        """Update the effective time at 80% power equivalent based on current power level
 
-def update_effective_time(self, current_time):
-    """Update the effective time at 80% power equivalent based on current power level"""
-    if self.last_time_check is None:
-        self.last_time_check = current_time
-        return self.effective_time_80_equiv
-
-    # Calculate elapsed time since last check
-    elapsed = current_time - self.last_time_check
-
-    # Convert to effective time based on current power level
-    effectiveness = self.power_effectiveness.get(self.current_power, 1.0)
-    effective_elapsed = elapsed * effectiveness
-
-    # Add to total effective time
-    self.effective_time_80_equiv += effective_elapsed
-
-    # Update last check time
-    self.last_time_check = current_time
-
-    return self.effective_time_80_equiv
-
+        control_loop initializes last_time_check before the first update.
+        """
+        # Calculate elapsed time since last check
+        elapsed = current_time - self.last_time_check
 
-def check_phase_transition(self, elapsed_time, current_time):
-    """Check if we should transition from goldening to browning phase based on effective time"""
-    # Update effective time at 80% power
-    effective_time = self.update_effective_time(current_time)
+        # Convert to effective time based on current power level
+        effective_elapsed = elapsed * self._current_effectiveness
 
-    if self.phase == "goldening" and effective_time > GOLDENING_THRESHOLD:
-        self.phase = "browning"
-        self.phase_transition_time = elapsed_time
-        print(f"\n===== TRANSITION: Goldening phase completed =====")
-        print(f"Real time elapsed: {elapsed_time:.2f}s")
-        print(f"Effective time at 80% power: {effective_time:.2f}s")
-        print(f"Entering browning phase\n")
-        return True
-    return False
+        # Add to total effective time
+        self.effective_time_80_equiv += effective_elapsed
 
+        # Update last check time
+        self.last_time_check = current_time
 
-def estimate_phase_times(self, current_r):
-    """Estimate remaining time in current phase and total time"""
-    if self.phase == "goldening":
-        # Estimate remaining time in goldening phase
-        # Using the 80% power equation, elapsed time at transition will be GOLDENING_THRESHOLD
-        effective_time = self.effective_time_80_equiv
-        remaining_goldening_time = max(0, GOLDENING_THRESHOLD - effective_time)
+        return self.effective_time_80_equiv
 
-        # Estimate total browning time based on current R value
-        # At the transition point, the R value should be around the goldening end value
-        # We can use the browning equation to estimate from there
-        transition_r = GOLDENING_80_EQUATION(GOLDENING_THRESHOLD)
+    def check_phase_transition(self, elapsed_time, current_time):
+        """Check if we should transition from goldening to browning phase based on effective time"""
+        # Update effective time at 80% power
+        effective_time = self.update_effective_time(current_time)
+
+        if self.phase == "goldening" and effective_time > GOLDENING_THRESHOLD:
+            self.phase = "browning"
+            self._phase_code = PHASE_BROWNING
+            self.phase_transition_time = elapsed_time
+            self._rebind_expected_r()
+            self.log.info("===== TRANSITION: Goldening phase completed =====")
+            self.log.info("Real time elapsed: %.2fs", elapsed_time)
+            self.log.info("Effective time at 80%% power: %.2fs", effective_time)
+            self.log.info("Entering browning phase")
+            return True
+        return False
+
+    def estimate_phase_times(self, current_r):
+        """Estimate remaining time in current phase and total time"""
+        if self.phase == "goldening":
+            # Estimate remaining time in goldening phase
+            # Using the 80% power equation, elapsed time at transition will be GOLDENING_THRESHOLD
+            effective_time = self.effective_time_80_equiv
+            remaining_goldening_time = max(0, GOLDENING_THRESHOLD - effective_time)
 
-        # Make sure the transition R value is reasonable
-        # If R is above the browning equation's y-intercept, the equation will give negative time
-        if transition_r > 195.10:  # This is the y-intercept from the browning equation
-            # Use a default estimate based on typical browning time
-            browning_time = 300  # Default to 5 minutes
+            # Browning has not started, so its estimate does not change
+            return remaining_goldening_time, _GOLDENING_BROWNING_TIME
         else:
-            browning_time = self.r_to_time_remaining(transition_r)
-            browning_time = max(60, browning_time)  # Ensure at least 60 seconds
-
-        return remaining_goldening_time, browning_time
-    else:
-        # Already in browning phase
-        remaining_time = self.r_to_time_remaining(current_r)
-        # Ensure positive time estimate
-        return 0, max(60, remaining_time)  # At least 60 seconds remaining
-
-
-def control_loop(self):
-    """Main control loop for the toaster"""
-    print("Starting control loop with baseline power at 80%...")
-    self.start_time = time.time()
-    self.last_time_check = self.start_time  # Initialize time tracking
-    self.set_power(DEFAULT_POWER)
-
-    # Calculate initial estimate for total process time
-    initial_goldening_time = GOLDENING_THRESHOLD
-    # Estimate browning time using the goldening end value
-    transition_r = GOLDENING_80_EQUATION(GOLDENING_THRESHOLD)
-    initial_browning_time = self.r_to_time_remaining(transition_r)
-
-    # Make sure estimates are reasonable
-    if initial_browning_time < 0:
-        print("Warning: Calculated negative browning time. Using default value.")
-        initial_browning_time = 300  # Default to 5 minutes
-
-    # Set the estimated finish time
-    total_estimated_time = initial_goldening_time + initial_browning_time
-    self.initial_estimated_finish_time = self.start_time + total_estimated_time
-
-    print(f"\n===== PROCESS TIMELINE =====")
-    print(
-        f"Estimated goldening time: {initial_goldening_time:.1f}s at 80% power equivalent"
-    )
-    print(f"Estimated browning time: {initial_browning_time:.1f}s")
-    print(f"Total estimated time: {total_estimated_time:.1f}s")
-    print(
-        f"Process will not end until at least {total_estimated_time - self.minimum_ending_time_buffer:.1f}s have elapsed"
-    )
-    print(f"Maximum power adjustment time: {MAX_ADJUSTMENT_TIME}s")
-    print(f"Stabilization period after power changes: {self.stabilization_period}s")
-    print(f"Power effectiveness ratios:")
-    print(f"  100% power = {self.power_effectiveness[100]:.2f}x effective as 80% power")
-    print(f"  80% power = {self.power_effectiveness[80]:.2f}x (baseline)")
-    print(f"  60% power = {self.power_effectiveness[60]:.2f}x effective as 80% power")
-    print("===============================\n")
-
-    try:
-        while True:
-            # Read data from sensor
-            line = self.ser.readline().decode("utf-8").strip()
-
-            if line.startswith("Ambient:"):
-                match_rgb = re.search(
-                    r"Ambient: (\d+) Red: (\d+) Green: (\d+) Blue: (\d+)", line
+            # Already in browning phase
+            remaining_time = self.r_to_time_remaining(current_r)
+            # Ensure positive time estimate
+            return 0, max(60, remaining_time)  # At least 60 seconds remaining
+
+    def control_loop(self):
+        """Main control loop for the toaster"""
+        try:
+            self.log.info("Starting control loop with baseline power at 80%...")
+            self.start_time = time.monotonic()
+            self.last_time_check = self.start_time  # Initialize time tracking
+            self._csv_last_flush = self.start_time
+            self.set_power(DEFAULT_POWER)
+
+            # Calculate initial estimate for total process time
+            initial_goldening_time = GOLDENING_THRESHOLD
+            # Estimate browning time using the goldening end value
+            initial_browning_time = self.r_to_time_remaining(_TRANSITION_R)
+
+            # Make sure estimates are reasonable
+            if initial_browning_time < 0:
+                self.log.warning(
+                    "Calculated negative browning time. Using default value."
                 )
-                if match_rgb:
-                    ambient, r_str, g, b = match_rgb.groups()
-                    r = int(r_str)
-
-                    # Read the LAB color values (but we mainly use RGB)
-                    lab_line = self.ser.readline().decode("utf-8").strip()
-                    match_lab = re.search(
-                        r"L: ([\d\.]+) a: ([\d\.]+) b: ([\d\.]+)", lab_line
-                    )
-
-                    if match_lab:
-                        L, a, b_lab = match_lab.groups()
-
-                        current_time = time.time()
-                        elapsed_time = current_time - self.start_time
-                        elapsed_time = round(elapsed_time, 2)
-
-                        # Update effective time at 80% power equivalent
-                        effective_time = self.update_effective_time(current_time)
-
-                        # Check if we need to transition from goldening to browning
-                        self.check_phase_transition(elapsed_time, current_time)
-
-                        # Calculate expected R value based on equations
-                        expected_r = self.calculate_expected_r(elapsed_time)
-                        difference = r - expected_r
-
-                        # Determine if power adjustment is needed (only when at 80% power)
-                        action = self.adjust_power(r, expected_r)
+                initial_browning_time = 300  # Default to 5 minutes
+
+            # Set the estimated finish time
+            total_estimated_time = initial_goldening_time + initial_browning_time
+            self.initial_estimated_finish_time = self.start_time + total_estimated_time
+            # Target counting may only begin once this (monotonic) time is reached
+            self._count_window_start = (
+                self.initial_estimated_finish_time - self.minimum_ending_time_buffer
+            )
 
-                        # Estimate phase times
-                        (
-                            remaining_goldening,
-                            remaining_browning,
-                        ) = self.estimate_phase_times(r)
+            self.log.info("===== PROCESS TIMELINE =====")
+            self.log.info(
+                "Estimated goldening time: %.1fs at 80%% power equivalent",
+                initial_goldening_time,
+            )
+            self.log.info("Estimated browning time: %.1fs", initial_browning_time)
+            self.log.info("Total estimated time: %.1fs", total_estimated_time)
+            self.log.info(
+                "Process will not end until at least %.1fs have elapsed",
+                total_estimated_time - self.minimum_ending_time_buffer,
+            )
+            self.log.info("Maximum power adjustment time: %ss", MAX_ADJUSTMENT_TIME)
+            self.log.info(
+                "Stabilization period after power changes: %ss",
+                self.stabilization_period,
+            )
+            self.log.info("Power effectiveness ratios:")
+            self.log.info(
+                "  100%% power = %.2fx effective as 80%% power",
+                self.power_effectiveness[100],
+            )
+            self.log.info(
+                "  80%% power = %.2fx (baseline)", self.power_effectiveness[80]
+            )
+            self.log.info(
+                "  60%% power = %.2fx effective as 80%% power",
+                self.power_effectiveness[60],
+            )
+            self.log.info("===============================")
+
+            # Bind names used on every packet to locals to skip attribute lookups
+            if self.binary_protocol:
+                read_packet = self._read_binary_packet
+            else:
+                read_packet = self._read_ascii_packet
+            monotonic = time.monotonic
+            start_time = self.start_time
+            update_effective_time = self.update_effective_time
+            check_phase_transition = self.check_phase_transition
+            calculate_expected_r = self.calculate_expected_r
+            adjust_power = self.adjust_power
+            estimate_phase_times = self.estimate_phase_times
+            log_row = self._csv_buf.append
+            target_r = self.target_r
+
+            while True:
+                # Read data from sensor. There is no sleep in this loop: the serial
+                # read blocks until the Arduino sends data (or TIMEOUT expires), so
+                # the loop runs exactly as fast as packets arrive without spinning
+                packet = read_packet()
+
+                if packet is not None:
+                    # RGB values drive control, LAB values are read but not used
+                    ambient, r, g, b, L, a, b_lab = packet
+
+                    # Take a single timestamp and use it for the whole packet
+                    now = monotonic()
+                    elapsed_time = now - start_time
+                    elapsed_time = round(elapsed_time, 2)
+
+                    # Update effective time at 80% power equivalent
+                    effective_time = update_effective_time(now)
+
+                    # Check if we need to transition from goldening to browning
+                    if check_phase_transition(elapsed_time, now):
+                        self._display_tick = 0  # Refresh estimates for the new phase
+
+                    # Calculate expected R value based on equations
+                    expected_r = calculate_expected_r(elapsed_time)
+                    difference = r - expected_r
+
+                    # Determine if power adjustment is needed (only when at 80% power)
+                    action = adjust_power(r, expected_r)
+
+                    # Don't use R values for control decisions when not at 80% power
+                    # or during stabilization period after power changes
+                    valid_r_for_control = (
+                        self.current_power == 80 and not self.stabilization_needed
+                    )
 
-                        # Don't use R values for control decisions when not at 80% power
-                        # or during stabilization period after power changes
-                        valid_r_for_control = (
-                            self.current_power == 80 and not self.stabilization_needed
-                        )
+                    # Store R value in buffer (for backward compatibility/debugging)
+                    if valid_r_for_control:
+                        self.r_values_buffer.append(r)
 
-                        # Store R value in buffer (for backward compatibility/debugging)
-                        if valid_r_for_control:
-                            self.r_values_buffer.append(r)
-                            if len(self.r_values_buffer) > self.readings_needed:
-                                self.r_values_buffer.pop(0)  # Keep buffer at fixed size
+                    if self.verbose:
+                        # Phase estimates are only displayed, so refresh them every
+                        # DISPLAY_REFRESH_TICKS packets and reuse them in between
+                        refresh = self._display_tick % DISPLAY_REFRESH_TICKS == 0
+                        self._display_tick += 1
+                        if refresh:
+                            self._phase_estimate = estimate_phase_times(r)
+                        remaining_goldening, remaining_browning = self._phase_estimate
 
                         # Display status with time remaining until allowed to end
-                        current_time = time.time()
-                        if self.initial_estimated_finish_time is not None:
+                        if refresh and self.initial_estimated_finish_time is not None:
                             time_until_estimated_finish = max(
-                                0, self.initial_estimated_finish_time - current_time
+                                0, self.initial_estimated_finish_time - now
                             )
                             if (
                                 time_until_estimated_finish
                                 > self.minimum_ending_time_buffer
                             ):
-                                print(
-                                    f"Time until target counting begins: {time_until_estimated_finish - self.minimum_ending_time_buffer:.1f}s"
+                                self.log.info(
+                                    "Time until target counting begins: %.1fs",
+                                    time_until_estimated_finish
+                                    - self.minimum_ending_time_buffer,
                                 )
                             elif self.counting_active:
-                                print(
-                                    f"Target counting active: {self.target_r_count}/{self.readings_needed} readings at/below target"
+                                self.log.info(
+                                    "Target counting active: %s/%s readings at/below target",
+                                    self.target_r_count,
+                                    self.readings_needed,
                                 )
                             else:
-                                print(
-                                    f"Ready to begin target counting (minimum time requirement met)"
+                                self.log.info(
+                                    "Ready to begin target counting (minimum time requirement met)"
                                 )
 
                         # Display status
-                        print(
-                            f"\nt={elapsed_time:.1f}s | Power={self.current_power}% | Phase={self.phase} | R={r}"
+                        self.log.info(
+                            "t=%.1fs | Power=%s%% | Phase=%s | R=%s",
+                            elapsed_time,
+                            self.current_power,
+                            self.phase,
+                            r,
+                        )
+                        self.log.info(
+                            "Effective time at 80%% power: %.1fs", effective_time
                         )
-                        print(f"Effective time at 80% power: {effective_time:.1f}s")
 
                         if valid_r_for_control:
-                            print(
-                                f"Expected R={expected_r:.1f} | Diff={difference:.1f} | R data valid for control"
+                            self.log.info(
+                                "Expected R=%.1f | Diff=%.1f | R data valid for control",
+                                expected_r,
+                                difference,
                             )
                         elif self.stabilization_needed:
-                            print(
-                                f"R data not used for control - in {self.stabilization_time_left:.1f}s stabilization period"
+                            self.log.info(
+                                "R data not used for control - in %.1fs stabilization period",
+                                self.stabilization_time_left,
                             )
                         else:
-                            print(
-                                f"R data not used for control during power adjustment"
+                            self.log.info(
+                                "R data not used for control during power adjustment"
                             )
 
                         # Display phase-specific information
                         if self.phase == "goldening":
-                            print(
-                                f"Goldening phase: {elapsed_time:.1f}s elapsed, estimated {remaining_goldening:.1f}s remaining"
+                            self.log.info(
+                                "Goldening phase: %.1fs elapsed, estimated %.1fs remaining",
+                                elapsed_time,
+                                remaining_goldening,
                             )
-                            print(
-                                f"Expected browning time after goldening: {remaining_browning:.1f}s"
+                            self.log.info(
+                                "Expected browning time after goldening: %.1fs",
+                                remaining_browning,
                             )
-                            print(
-                                f"Total estimated time remaining: {remaining_goldening + remaining_browning:.1f}s"
+                            self.log.info(
+                                "Total estimated time remaining: %.1fs",
+                                remaining_goldening + remaining_browning,
                             )
                         else:  # browning phase
                             time_in_browning = elapsed_time - self.phase_transition_time
-                            print(
-                                f"Browning phase: {time_in_browning:.1f}s elapsed, estimated {remaining_browning:.1f}s remaining"
+                            self.log.info(
+                                "Browning phase: %.1fs elapsed, estimated %.1fs remaining",
+                                time_in_browning,
+                                remaining_browning,
                             )
-                            print(
-                                f"Total time so far: {elapsed_time:.1f}s (Goldening: {self.phase_transition_time:.1f}s, Browning: {time_in_browning:.1f}s)"
+                            self.log.info(
+                                "Total time so far: %.1fs (Goldening: %.1fs, Browning: %.1fs)",
+                                elapsed_time,
+                                self.phase_transition_time,
+                                time_in_browning,
                             )
 
                         # If in power adjustment, show remaining adjustment time
                         if self.adjustment_time_left > 0:
-                            print(
-                                f"Power adjustment: {self.current_power}% for {self.adjustment_time_left:.1f}s more"
-                            )
-
-                        # Log data
-                        with open(self.output_file, "a", newline="") as csvfile:
-                            writer = csv.writer(csvfile)
-                            writer.writerow(
-                                [
-                                    elapsed_time,
-                                    self.current_power,
-                                    self.phase,
-                                    r,
-                                    g,
-                                    b,
-                                    round(expected_r, 2),
-                                    round(difference, 2),
-                                    action,
-                                    round(effective_time, 2),
-                                ]
+                            self.log.info(
+                                "Power adjustment: %s%% for %.1fs more",
+                                self.current_power,
+                                self.adjustment_time_left,
                             )
+                    else:
+                        # Compact one-line status
+                        self.log.info(
+                            "t=%.1f P=%s R=%s ExpR=%.1f d=%+.1f",
+                            elapsed_time,
+                            self.current_power,
+                            r,
+                            expected_r,
+                            difference,
+                        )
 
-                        # Check if we've reached the target R value (non-consecutive counting)
-                        if (
-                            TARGET_R_VALUE is not None
-                            and self.phase == "browning"
-                            and valid_r_for_control
-                        ):
-                            # Check if we're close enough to the estimated finish time to start counting
-                            current_time = time.time()
-                            time_until_estimated_finish = max(
-                                0, self.initial_estimated_finish_time - current_time
+                    # Log data (every field but Action is numeric or a fixed word,
+                    # so only Action can need CSV quoting)
+                    action_field = f'"{action}"' if "," in action else action
+                    log_row(
+                        f"{elapsed_time},{self.current_power},{self.phase},{r},{g},{b},"
+                        f"{expected_r:.2f},{difference:.2f},{action_field},{effective_time:.2f}\r\n"
+                    )
+                    if (
+                        len(self._csv_buf) >= CSV_FLUSH_ROWS
+                        or now - self._csv_last_flush >= CSV_FLUSH_INTERVAL
+                    ):
+                        self._flush_log()
+                        self._csv_last_flush = now
+
+                    # Check if we've reached the target R value (non-consecutive counting)
+                    if (
+                        target_r is not None
+                        and self.phase == "browning"
+                        and valid_r_for_control
+                    ):
+                        # Check if we're close enough to the estimated finish time to start counting
+                        count_allowed = now >= self._count_window_start
+
+                        # If we're within the target time window, start counting
+                        if count_allowed and not self.counting_active:
+                            self.counting_active = True
+                            self.target_r_count = 0
+                            self.log.info("===== ENTERING TARGET COUNTING PHASE =====")
+                            self.log.info(
+                                "Now within %s seconds of estimated finish time",
+                                self.minimum_ending_time_buffer,
                             )
-                            count_allowed = (
-                                time_until_estimated_finish
-                                <= self.minimum_ending_time_buffer
+                            self.log.info(
+                                "Starting to count readings at/below target R=%s",
+                                target_r,
                             )
 
-                            # If we're within the target time window, start counting
-                            if count_allowed and not self.counting_active:
-                                self.counting_active = True
-                                self.target_r_count = 0
-                                print(f"\n===== ENTERING TARGET COUNTING PHASE =====")
-                                print(
-                                    f"Now within {self.minimum_ending_time_buffer} seconds of estimated finish time"
-                                )
-                                print(
-                                    f"Starting to count readings at/below target R={TARGET_R_VALUE}"
-                                )
-
-                            # If current reading is at or below target and we're counting, increment counter
-                            if self.counting_active and r <= TARGET_R_VALUE:
-                                self.target_r_count += 1
-                                print(
-                                    f"Target R count: {self.target_r_count}/{self.readings_needed} readings at/below target"
+                        # If current reading is at or below target and we're counting, increment counter
+                        if self.counting_active and r <= target_r:
+                            self.target_r_count += 1
+                            if self.verbose:
+                                self.log.info(
+                                    "Target R count: %s/%s readings at/below target",
+                                    self.target_r_count,
+                                    self.readings_needed,
                                 )
 
-                            # Debug output
-                            if self.counting_active:
-                                print(
-                                    f"Current R={r}, Target R={TARGET_R_VALUE}, Count={self.target_r_count}/{self.readings_needed}"
-                                )
+                        # Debug output
+                        if self.verbose and self.counting_active:
+                            self.log.info(
+                                "Current R=%s, Target R=%s, Count=%s/%s",
+                                r,
+                                target_r,
+                                self.target_r_count,
+                                self.readings_needed,
+                            )
 
-                            # Check if we've reached the required number of readings
-                            if (
-                                self.counting_active
-                                and self.target_r_count >= self.readings_needed
-                            ):
-                                print(f"\n===== TARGET REACHED =====")
-                                print(
-                                    f"Detected {self.target_r_count} readings at/below target R={TARGET_R_VALUE}"
-                                )
-                                print(
-                                    f"Total time: {elapsed_time:.1f}s (Goldening: {self.phase_transition_time:.1f}s, Browning: {elapsed_time - self.phase_transition_time:.1f}s)"
-                                )
-                                print("Stopping heating elements.")
-                                self.set_power(0)  # Turn off heating
-                                break
+                        # Check if we've reached the required number of readings
+                        if (
+                            self.counting_active
+                            and self.target_r_count >= self.readings_needed
+                        ):
+                            self.log.info("===== TARGET REACHED =====")
+                            self.log.info(
+                                "Detected %s readings at/below target R=%s",
+                                self.target_r_count,
+                                target_r,
+                            )
+                            self.log.info(
+                                "Total time: %.1fs (Goldening: %.1fs, Browning: %.1fs)",
+                                elapsed_time,
+                                self.phase_transition_time,
+                                elapsed_time - self.phase_transition_time,
+                            )
+                            self.log.info("Stopping heating elements.")
+                            self.set_power(0)  # Turn off heating
+                            break
+
+        except KeyboardInterrupt:
+            self.log.info("Toaster control stopped by user.")
+            self.set_power(0)  # Turn off heating when stopping
+
+        finally:
+            self.close()
+
+    def close(self):
+        """Close the serial port, CSV log and logging thread
+
+        control_loop calls this when it exits. A controller that is never run
+        should be closed by its owner. Calling it again does nothing.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.ser.close()
+        self._flush_log()
+        self._csv_fp.close()
+        self.log.info("Serial connection closed.")
+        self._log_listener.stop()
+        # Detach from the shared "toastbot" logger so a later controller
+        # doesn't also write into this one's stopped queue
+        self.log.removeHandler(self._log_handler)
+        for handler in self._log_listener.handlers:
+            handler.close()
 
-            # Brief pause to prevent excessive CPU usage
-            time.sleep(0.1)
 
-    except KeyboardInterrupt:
-        print("\nToaster control stopped by user.")
-        self.set_power(0)  # Turn off heating when stopping
+def main():
+    print("===== Toaster Control System =====")
+    print("This system controls toasting based on color sensor readings.")
 
-    finally:
-        self.ser.close()
-        print("Serial connection closed.")
+    # Get target R value from user
+    try:
+        target_r = int(
+            input(
+                "Enter target R value (lower means darker toast, typically 120-160): "
+            )
+        )
+        print(f"Target R value set to {target_r}")
+        print(
+            f"Note: The toaster will stop after detecting {5} readings at/below this target"
+        )
+        print(
+            "      (not necessarily consecutive), and only after entering the browning phase"
+        )
+        print("      and being within 60 seconds of the estimated finish time.")
+    except ValueError:
+        print("Invalid input. Using default tracking without target.")
+        target_r = TARGET_R_VALUE
 
+    # Initialize and start controller
+    controller = ToasterController(PORT, BAUD_RATE, TIMEOUT, target_r=target_r)
+    controller.control_loop()
 
-def main():
-    global TARGET_R_VALUE
-
-
-print("===== Toaster Control System =====")
-print("This system controls toasting based on color sensor readings.")
-
-# Get target R value from user
-try:
-    TARGET_R_VALUE = int(
-        input("Enter target R value (lower means darker toast, typically 120-160): ")
-    )
-    print(f"Target R value set to {TARGET_R_VALUE}")
-    print(
-        f"Note: The toaster will stop after detecting {5} readings at/below this target"
-    )
-    print(
-        "      (not necessarily consecutive), and only after entering the browning phase"
-    )
-    print("      and being within 60 seconds of the estimated finish time.")
-except ValueError:
-    print("Invalid input. Using default tracking without target.")
-    TARGET_R_VALUE = None
-
-# Initialize and start controller
-controller = ToasterController(PORT, BAUD_RATE, TIMEOUT)
-controller.control_loop()
 
 if __name__ == "__main__":
     main()